@@ -20,14 +20,27 @@ The script accepts a full playlist URL, a spotify:playlist:... URI, or a bare pl
 
 import argparse
 import csv
+import glob
+import gzip
+import heapq
+import json
 import os
 import re
 import sys
-from typing import List, Dict, Any
-
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+import requests
 import spotipy
-import spotipy.util
-from spotipy.oauth2 import SpotifyClientCredentials
+from requests.adapters import HTTPAdapter
+from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
+from spotipy.oauth2 import SpotifyClientCredentials, SpotifyOAuth, SpotifyOauthError
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -49,80 +62,285 @@ except Exception as _e:
     # telemetry is unavailable or misconfigured.
     LOGFIRE = None
 
+# Optional HTTP caching: with `cachecontrol` installed, API responses that
+# carry Cache-Control/ETag headers are stored on disk and revalidated with
+# If-None-Match, so unchanged resources come back as bodiless 304s.
+try:
+    from cachecontrol import CacheControlAdapter
+    from cachecontrol.caches.file_cache import FileCache
+except ImportError:
+    CacheControlAdapter = None
+
 
 API_BASE = "https://api.spotify.com/v1"
 
+# Matches both ".../playlist/<id>" URLs and "spotify:playlist:<id>" URIs
+_PLAYLIST_ID_RE = re.compile(r"playlist[/:]([A-Za-z0-9]+)")
+
+# Characters that must not reach the generated HTML unescaped. The cell
+# templates quote attributes with single quotes, so those are covered too.
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+# Fetched playlist items are cached per (playlist_id, snapshot_id). Spotify
+# issues a new snapshot_id whenever a playlist changes, so a hit is current.
+CACHE_DIR = os.path.join(os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                         "spotify-toolkit")
+
+# User OAuth tokens are persisted here (suffixed with the username) so
+# repeat runs refresh the cached token instead of reopening the browser.
+TOKEN_CACHE_PATH = ".spotify_token_cache"
+
+# Landing-page generation fetches this many playlists concurrently; 429s
+# are retried with backoff by the session's Retry policy.
+LANDING_WORKERS = 8
+
+# The audio-features endpoint accepts at most 100 IDs per request; the
+# batches are independent so a few are kept in flight at once.
+AUDIO_FEATURES_BATCH = 100
+AUDIO_FEATURES_WORKERS = 4
+
+# Once the first page of a playlist reports its total, the remaining pages
+# are requested concurrently by offset. The semaphore caps those extra page
+# requests across all playlists so, together with the landing-page workers,
+# in-flight requests stay within the session's connection pool.
+PAGE_WORKERS = 4
+_PAGE_SLOTS = threading.BoundedSemaphore(8)
+
+
+def build_session(http_cache: bool = True) -> requests.Session:
+    # One pooled keep-alive session shared by every worker thread so
+    # requests to api.spotify.com reuse connections instead of paying a
+    # fresh TCP+TLS handshake per call.
+    retry = Retry(total=3, backoff_factor=0.5,
+                  status_forcelist=[429, 502, 503])
+    pool = dict(pool_connections=1, pool_maxsize=16, max_retries=retry)
+    if http_cache and CacheControlAdapter is not None:
+        adapter = CacheControlAdapter(
+            cache=FileCache(os.path.join(CACHE_DIR, "http")), **pool)
+    else:
+        adapter = HTTPAdapter(**pool)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+class SharedTokenCache(MemoryCacheHandler):
+    # Token cache for the shared auth manager: the file is read once, then the
+    # token lives in memory. Saved tokens go to memory first and are written
+    # through to the file for the next run, so a failed file write (spotipy
+    # only logs it) never leaves the running process without a token.
+
+    def __init__(self, token_file: CacheFileHandler):
+        super().__init__(token_file.get_cached_token())
+        self._token_file = token_file
+
+    def save_token_to_cache(self, token_info):
+        super().save_token_to_cache(token_info)
+        self._token_file.save_token_to_cache(token_info)
+
+
+class SharedTokenOAuth(SpotifyOAuth):
+    # Auth manager for the client shared by the worker threads. spotipy asks
+    # it for a token on every request, so it reads from SharedTokenCache in
+    # memory, and a lock ensures only one thread refreshes an expired token.
+
+    def __init__(self, *args, token_file: CacheFileHandler, **kwargs):
+        super().__init__(*args, cache_handler=SharedTokenCache(token_file), **kwargs)
+        self._token_lock = threading.Lock()
+
+    def get_access_token(self, *args, **kwargs):
+        with self._token_lock:
+            return super().get_access_token(*args, **kwargs)
+
+
+def html_escape(value: Any) -> Any:
+    # str.translate does the substitution in a single C-level pass;
+    # numbers (durations, audio features) need no escaping
+    return value.translate(_HTML_ESCAPE) if isinstance(value, str) else value
+
 
 def extract_playlist_id(s: str) -> str:
     # Accept URL, URI, or raw ID
-    m = re.search(r"playlist/([A-Za-z0-9]+)", s)
-    if m:
-        return m.group(1)
-    m = re.search(r"spotify:playlist:([A-Za-z0-9]+)", s)
+    m = _PLAYLIST_ID_RE.search(s)
     if m:
         return m.group(1)
     # Assume it's already an ID
     return s.strip()
 
 
-def mmss(ms: int) -> str:
-    total_seconds = ms // 1000
-    m, s = divmod(total_seconds, 60)
-    return f"{m}:{s:02d}"
+def iter_tracks(sp: spotipy.Spotify, playlist_id: str) -> Iterator[Dict[str, Any]]:
+    # Yield track items in playlist order. Pages after the first are fetched
+    # in parallel, so pagination costs roughly one round-trip per
+    # PAGE_WORKERS pages instead of one per page.
+    first = sp.playlist_tracks(playlist_id)
+    if not first.get('next'):
+        yield from first['items']
+        return
+
+    limit = first['limit']
+
+    def fetch_page(offset: int) -> List[Dict[str, Any]]:
+        with _PAGE_SLOTS:
+            return sp.playlist_tracks(playlist_id, limit=limit, offset=offset)['items']
+
+    with ThreadPoolExecutor(max_workers=PAGE_WORKERS) as executor:
+        # Submit the remaining pages before handing out the first one
+        pages = executor.map(fetch_page, range(first['offset'] + limit, first['total'], limit))
+        yield from first['items']
+        for items in pages:
+            yield from items
 
 
 def fetch_tracks(sp: spotipy.Spotify, playlist_id: str) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    results = sp.playlist_tracks(playlist_id)
-    while results:
-        batch = results['items']
-        items.extend(batch)
-        results = sp.next(results)
-    return items
-
-
-def to_rows(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
-    for item in items:
-        added_at = item.get("added_at", "")
-        track = item.get("track") or {}
-        if not track:
-            continue
-        name = track.get("name", "")
-        artists = ", ".join([a.get("name", "")
-                            for a in track.get("artists", [])])
-        album = track.get("album", {}).get("name", "")
-        duration_ms = int(track.get("duration_ms") or 0)
-        duration = mmss(duration_ms)
-        url = (track.get("external_urls") or {}).get("spotify", "")
-        uri = track.get("uri", "")
-        rows.append({
-            "title": name,
-            "artists": artists,
-            "album": album,
-            "duration_ms": duration_ms,
-            "duration_mm_ss": duration,
-            "added_at": added_at,
-            "spotify_url": url,
-            "spotify_uri": uri,
-        })
-    return rows
-
-
-def get_playlist_created_date(sp: spotipy.Spotify, playlist_id: str) -> str:
-    items = fetch_tracks(sp, playlist_id)
-    if not items:
-        return "Unknown"
-    added_ats = [item.get('added_at')
-                 for item in items if item.get('added_at')]
-    if not added_ats:
-        return "Unknown"
+    return list(iter_tracks(sp, playlist_id))
+
+
+def _track_cache_path(playlist_id: str, snapshot_id: str) -> str:
+    # Snapshot IDs are base64 and may contain "/"
+    return os.path.join(CACHE_DIR, f"{playlist_id}-{snapshot_id.replace('/', '_')}.json.gz")
+
+
+def _write_track_cache(playlist_id: str, path: str, items: List[Dict[str, Any]]):
+    payload = gzip.compress(json.dumps(items).encode("utf-8"))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial file
+        f = tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False)
+        try:
+            with f:
+                f.write(payload)
+            os.replace(f.name, path)
+        except OSError:
+            # Don't leave the orphaned temp file behind on every failed run
+            os.unlink(f.name)
+            raise
+        # Drop entries for older snapshots of the same playlist
+        for stale in glob.glob(os.path.join(CACHE_DIR, f"{glob.escape(playlist_id)}-*.json.gz")):
+            if stale != path:
+                os.remove(stale)
+    except OSError:
+        # The cache is only an optimisation; an unwritable cache directory
+        # must not fail the export.
+        pass
+
+
+def cached_tracks(sp: spotipy.Spotify, playlist_id: str, snapshot_id: str) -> Iterator[Dict[str, Any]]:
+    # Same items as iter_tracks(), served from disk when this snapshot of the
+    # playlist has been fetched before
+    if not snapshot_id:
+        yield from iter_tracks(sp, playlist_id)
+        return
+    path = _track_cache_path(playlist_id, snapshot_id)
+    try:
+        with open(path, "rb") as f:
+            items = json.loads(gzip.decompress(f.read()))
+    except (OSError, ValueError):
+        # Missing or corrupt cache entry: fall through to the API
+        items = None
+    if items is not None:
+        yield from items
+        return
+
+    items = []
+    for item in iter_tracks(sp, playlist_id):
+        items.append(item)
+        yield item
+    _write_track_cache(playlist_id, path, items)
+
+
+def _track_row(item: Dict[str, Any], track: Dict[str, Any], _join=", ".join) -> Dict[str, Any]:
+    # Helpers are bound as default args so the per-track lookups are locals;
+    # mm:ss is formatted inline to skip a function call per track
+    get = track.get
+    duration_ms = int(get("duration_ms") or 0)
+    seconds = duration_ms // 1000
+    return {
+        "title": get("name", ""),
+        "artists": _join([a.get("name", "") for a in get("artists") or ()]),
+        "album": (get("album") or {}).get("name", ""),
+        "duration_ms": duration_ms,
+        "duration_mm_ss": f"{seconds // 60}:{seconds % 60:02d}",
+        "added_at": item.get("added_at", ""),
+        "spotify_url": (get("external_urls") or {}).get("spotify", ""),
+        "spotify_uri": get("uri", ""),
+    }
+
+
+def to_rows(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Items whose track is missing (e.g. removed from Spotify) are skipped
+    return [_track_row(item, track) for item in items if (track := item.get("track"))]
+
+
+def fetch_audio_features(sp: spotipy.Spotify, track_ids: List[str]) -> List[Dict[str, Any]]:
+    chunks = [track_ids[i:i + AUDIO_FEATURES_BATCH]
+              for i in range(0, len(track_ids), AUDIO_FEATURES_BATCH)]
+    with ThreadPoolExecutor(max_workers=AUDIO_FEATURES_WORKERS) as executor:
+        batches = executor.map(sp.audio_features, chunks)
+        # Keep positions aligned with track_ids even if a batch comes back empty
+        return [features
+                for chunk, batch in zip(chunks, batches)
+                for features in (batch or [None] * len(chunk))]
+
+
+def row_fieldnames(rows: List[Dict[str, Any]]) -> List[str]:
+    # Ordered union of row keys, so no column depends on which row comes
+    # first (e.g. a leading local file that has no audio features)
+    if not rows:
+        return ["title", "artists", "album", "duration_ms", "duration_mm_ss",
+                "added_at", "spotify_url", "spotify_uri"]
+    return list(dict.fromkeys(field for row in rows for field in row))
+
+
+def row_values(fieldnames: List[str]):
+    # Map a row dict to a tuple ordered by fieldnames. itemgetter does the
+    # lookups in C; rows missing a column (e.g. no audio features for a
+    # track) fall back to blank cells like csv.DictWriter's restval.
+    # Keys outside fieldnames are not written, so fieldnames must come from
+    # row_fieldnames() to cover every row.
+    getter = itemgetter(*fieldnames)
+
+    def values(row: Dict[str, Any]) -> Tuple[Any, ...]:
+        try:
+            return getter(row)
+        except KeyError:
+            return tuple(row.get(field, "") for field in fieldnames)
+    return values
+
+
+def get_playlist_created_date(items: Iterable[Dict[str, Any]]) -> str:
+    # Takes already-fetched track items (rows carry added_at too) so callers
+    # don't paginate twice.
     # Return the earliest added_at as approximation of creation date
-    return min(added_ats)
+    return min((item['added_at'] for item in items if item.get('added_at')),
+               default="Unknown")
 
 
-def generate_landing_page(top_albums: List[Dict[str, Any]], created_date_playlists: List[Dict[str, Any]], all_playlists: List[Dict[str, Any]], output: str = "index.html"):
-    html = """<!DOCTYPE html>
+def process_playlist(sp: spotipy.Spotify, playlist: Dict[str, Any], use_cache: bool = True) -> Tuple[str, List[Dict[str, Any]]]:
+    if use_cache:
+        tracks = cached_tracks(sp, playlist['id'], playlist.get('snapshot_id'))
+    else:
+        tracks = iter_tracks(sp, playlist['id'])
+    # to_rows() skips items whose track was removed from Spotify; set those
+    # aside so their added_at still counts toward the created date
+    dropped: List[Dict[str, Any]] = []
+
+    def noting_dropped(items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        for item in items:
+            if not item.get("track"):
+                dropped.append(item)
+            yield item
+
+    rows = to_rows(noting_dropped(tracks))
+    return get_playlist_created_date(chain(rows, dropped)), rows
+
+
+_LANDING_HEADER = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -147,79 +365,41 @@ def generate_landing_page(top_albums: List[Dict[str, Any]], created_date_playlis
         <h2>Top 10 Albums</h2>
         <ul class="playlist-list">
 """
-    for playlist in top_albums:
-        name = playlist.get('name', '')
-        pid = playlist.get('id', '')
-        total_tracks = playlist.get('tracks', {}).get('total', 0)
-        html += f"""            <li>
+
+_LANDING_ITEM = """            <li>
                 <a href="{pid}.html">
                     <div class="playlist-name">{name}</div>
-                    <div class="playlist-details">{total_tracks} tracks</div>
+                    <div class="playlist-details">{details}</div>
                 </a>
             </li>
 """
-    html += """        </ul>
+
+_LANDING_CREATED_SECTION = """        </ul>
     </div>
     <div class="section">
         <h2>Created Date</h2>
         <ul class="playlist-list">
 """
-    for playlist in created_date_playlists:
-        name = playlist.get('name', '')
-        pid = playlist.get('id', '')
-        total_tracks = playlist.get('tracks', {}).get('total', 0)
-        created_date = playlist.get('created_date', 'Unknown')
-        if created_date != 'Unknown':
-            # Format date
-            created_date = created_date[:10]  # YYYY-MM-DD
-        html += f"""            <li>
-                <a href="{pid}.html">
-                    <div class="playlist-name">{name}</div>
-                    <div class="playlist-details">{total_tracks} tracks - Created: {created_date}</div>
-                </a>
-            </li>
-"""
-    html += """        </ul>
+
+_LANDING_ALL_SECTION = """        </ul>
     </div>
     <div class="section">
         <h2>All Playlists</h2>
         <ul class="playlist-list">
 """
-    for playlist in sorted(all_playlists, key=lambda x: x.get('name', '').lower()):
-        name = playlist.get('name', '')
-        pid = playlist.get('id', '')
-        total_tracks = playlist.get('tracks', {}).get('total', 0)
-        html += f"""            <li>
-                <a href="{pid}.html">
-                    <div class="playlist-name">{name}</div>
-                    <div class="playlist-details">{total_tracks} tracks</div>
-                </a>
-            </li>
-"""
-    html += """        </ul>
+
+_LANDING_FOOTER = """        </ul>
     </div>
 </body>
 </html>"""
-    with open(output, "w", encoding="utf-8") as f:
-        f.write(html)
-
 
-def generate_html(playlist_name: str, fieldnames: List[str], rows: List[Dict[str, Any]], output: str):
-    # Generate text file with numbered list
-    txt_output = output.replace('.html', '.txt')
-    with open(txt_output, 'w', encoding='utf-8') as f:
-        f.write(f"{playlist_name}\n\n")
-        for i, row in enumerate(rows, 1):
-            title = row.get('title', '')
-            artists = row.get('artists', '')
-            f.write(f"{i}. {title} - {artists}\n")
-
-    html = f"""<!DOCTYPE html>
+# Formatted with title and txt_href, hence the doubled CSS braces
+_PLAYLIST_HEADER = """<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{playlist_name} - Spotify Playlist</title>
+    <title>{title} - Spotify Playlist</title>
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; background-color: #f5f5f5; }}
         h1 {{ color: #1DB954; text-align: center; }}
@@ -237,65 +417,120 @@ def generate_html(playlist_name: str, fieldnames: List[str], rows: List[Dict[str
     </style>
 </head>
 <body>
-    <h1>{playlist_name}</h1>
+    <h1>{title}</h1>
     <div class="download">
-        <a href="{txt_output}" download>Download Numbered List</a>
+        <a href="{txt_href}" download>Download Numbered List</a>
     </div>
     <table id="playlist-table">
         <thead>
             <tr>
 """
-    for field in fieldnames:
-        if field == "duration_mm_ss":
-            html += f"                <th class='duration'>{field.replace('_', ' ').title()}</th>\n"
-        elif "url" in field:
-            html += f"                <th class='url'>{field.replace('_', ' ').title()}</th>\n"
-        else:
-            html += f"                <th>{field.replace('_', ' ').title()}</th>\n"
-    html += """            </tr>
+
+_PLAYLIST_TBODY_START = """            </tr>
         </thead>
         <tbody>
 """
-    for row in rows:
-        html += "            <tr>\n"
-        for field in fieldnames:
-            value = row.get(field, "")
-            if field == "spotify_url":
-                html += f"                <td class='url'><a href='{value}' target='_blank'>Open in Spotify</a></td>\n"
-            elif field == "duration_mm_ss":
-                html += f"                <td class='duration'>{value}</td>\n"
-            else:
-                html += f"                <td>{value}</td>\n"
-        html += "            </tr>\n"
-    html += """        </tbody>
+
+_PLAYLIST_FOOTER = """        </tbody>
     </table>
     <script>
         // Simple sort functionality
-        document.querySelectorAll('th').forEach(header => {{
-            header.addEventListener('click', () => {{
+        document.querySelectorAll('th').forEach(header => {
+            header.addEventListener('click', () => {
                 const table = header.closest('table');
                 const tbody = table.querySelector('tbody');
                 const rows = Array.from(tbody.querySelectorAll('tr'));
                 const index = Array.from(header.parentNode.children).indexOf(header);
                 const isNumeric = header.classList.contains('duration') || header.textContent.includes('Ms');
                 
-                rows.sort((a, b) => {{
+                rows.sort((a, b) => {
                     const aVal = a.children[index].textContent.trim();
                     const bVal = b.children[index].textContent.trim();
-                    if (isNumeric) {{
+                    if (isNumeric) {
                         return parseFloat(aVal.replace(':', '.')) - parseFloat(bVal.replace(':', '.'));
-                    }}
+                    }
                     return aVal.localeCompare(bVal);
-                }});
+                });
                 
                 rows.forEach(row => tbody.appendChild(row));
-            }});
-        }});
+            });
+        });
     </script>
 </body>
 </html>"""
-    with open(output, "w", encoding="utf-8") as f:
-        f.write(html)
+
+
+def cell_format(field: str) -> str:
+    # %-style template for one <td> of the playlist table
+    if field == "spotify_url":
+        return "                <td class='url'><a href='%s' target='_blank'>Open in Spotify</a></td>\n"
+    if field == "duration_mm_ss":
+        return "                <td class='duration'>%s</td>\n"
+    return "                <td>%s</td>\n"
+
+
+def generate_landing_page(top_albums: List[Dict[str, Any]], created_date_playlists: List[Dict[str, Any]], all_playlists: List[Dict[str, Any]], output: str = "index.html"):
+    # Stream straight into a buffered file instead of growing one big string
+    with open(output, "w", encoding="utf-8", buffering=65536) as f:
+        write = f.write
+        item = _LANDING_ITEM.format
+        write(_LANDING_HEADER)
+        for playlist in top_albums:
+            total_tracks = playlist.get('tracks', {}).get('total', 0)
+            write(item(pid=playlist.get('id', ''),
+                       name=html_escape(playlist.get('name', '')),
+                       details=f"{total_tracks} tracks"))
+        write(_LANDING_CREATED_SECTION)
+        for playlist in created_date_playlists:
+            total_tracks = playlist.get('tracks', {}).get('total', 0)
+            created_date = playlist.get('created_date', 'Unknown')
+            if created_date != 'Unknown':
+                # Format date
+                created_date = created_date[:10]  # YYYY-MM-DD
+            write(item(pid=playlist.get('id', ''),
+                       name=html_escape(playlist.get('name', '')),
+                       details=f"{total_tracks} tracks - Created: {created_date}"))
+        write(_LANDING_ALL_SECTION)
+        # Decorate with lowercased names so the sort key is a C-level itemgetter
+        decorated = [(p.get('name', '').lower(), p) for p in all_playlists]
+        decorated.sort(key=itemgetter(0))
+        for _, playlist in decorated:
+            total_tracks = playlist.get('tracks', {}).get('total', 0)
+            write(item(pid=playlist.get('id', ''),
+                       name=html_escape(playlist.get('name', '')),
+                       details=f"{total_tracks} tracks"))
+        write(_LANDING_FOOTER)
+
+
+def generate_html(playlist_name: str, fieldnames: List[str], rows: List[Dict[str, Any]], output: str):
+    # Generate text file with numbered list
+    txt_output = output.replace('.html', '.txt')
+    with open(txt_output, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(f"{playlist_name}\n\n")
+        f.writelines(f"{i}. {row.get('title', '')} - {row.get('artists', '')}\n"
+                     for i, row in enumerate(rows, 1))
+
+    title = html_escape(playlist_name)
+    txt_href = html_escape(txt_output)
+    # Stream straight into a buffered file instead of growing one big string
+    with open(output, "w", encoding="utf-8", buffering=65536) as f:
+        write = f.write
+        write(_PLAYLIST_HEADER.format(title=title, txt_href=txt_href))
+        for field in fieldnames:
+            if field == "duration_mm_ss":
+                write(f"                <th class='duration'>{field.replace('_', ' ').title()}</th>\n")
+            elif "url" in field:
+                write(f"                <th class='url'>{field.replace('_', ' ').title()}</th>\n")
+            else:
+                write(f"                <th>{field.replace('_', ' ').title()}</th>\n")
+        write(_PLAYLIST_TBODY_START)
+        # Resolve each column's cell format once and build one template for a
+        # whole row, so each row is a single %-substitution
+        row_tmpl = "            <tr>\n" + "".join(map(cell_format, fieldnames)) + "            </tr>\n"
+        values = row_values(fieldnames)
+        escape = html_escape
+        write("".join([row_tmpl % tuple(map(escape, values(row))) for row in rows]))
+        write(_PLAYLIST_FOOTER)
 
 
 def main():
@@ -317,6 +552,8 @@ def main():
                         help="Generate a landing page (index.html) with links to playlist pages")
     parser.add_argument("--include-audio-features", action="store_true",
                         help="Include audio features (danceability, energy, etc.) in export")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help=f"Bypass the track and HTTP response caches in {CACHE_DIR}")
     parser.add_argument("--format", choices=["csv", "html"], default="csv",
                         help="Output format: csv or html (default: csv)")
     parser.add_argument(
@@ -332,6 +569,14 @@ def main():
     if not args.list and not args.playlist and not args.landing_page:
         parser.error("--playlist, --list, or --landing-page is required")
 
+    session = build_session(http_cache=args.cache)
+    try:
+        run(args, session)
+    finally:
+        session.close()
+
+
+def run(args: argparse.Namespace, session: requests.Session):
     client_id = args.client_id or os.getenv("SPOTIFY_CLIENT_ID")
     if not client_id:
         client_id = input("Enter Spotify Client ID: ").strip()
@@ -349,18 +594,27 @@ def main():
             redirect_uri = input("Enter Spotify Redirect URI: ").strip()
 
         scope = "playlist-read-private playlist-read-collaborative playlist-modify-public playlist-modify-private"
-        token = spotipy.util.prompt_for_user_token(
-            username, scope, client_id, client_secret, redirect_uri)
-        if not token:
+        auth_manager = SharedTokenOAuth(
+            client_id, client_secret, redirect_uri, scope=scope,
+            token_file=CacheFileHandler(
+                cache_path=f"{TOKEN_CACHE_PATH}-{username}", username=username))
+        # Resolve the token up front on the main thread: served from the
+        # cache file (refreshed if expired) and only prompts interactively
+        # when nothing is cached yet. Worker threads then reuse it from
+        # memory and refresh it mid-run if needed.
+        try:
+            auth_manager.get_access_token(as_dict=False)
+        except SpotifyOauthError as e:
             raise SystemExit(
-                "Unable to get token. Check your credentials and try again.")
-        sp = spotipy.Spotify(auth=token)
+                f"Unable to get token ({e}). Check your credentials and try again.")
+        sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=session)
     else:
         # Client credentials for public read operations
         client_credentials_manager = SpotifyClientCredentials(
             client_id, client_secret)
         sp = spotipy.Spotify(
-            client_credentials_manager=client_credentials_manager)
+            client_credentials_manager=client_credentials_manager,
+            requests_session=session)
 
     if args.create_playlist:
         playlist = sp.user_playlist_create(
@@ -386,23 +640,23 @@ def main():
         while results:
             playlists.extend(results['items'])
             results = sp.next(results)
+        # Fetch every playlist concurrently; HTML is rendered afterwards
+        with ThreadPoolExecutor(max_workers=LANDING_WORKERS) as executor:
+            results = list(executor.map(partial(process_playlist, sp, use_cache=args.cache), playlists))
         # Add created_date to each playlist
-        for p in playlists:
-            p['created_date'] = get_playlist_created_date(sp, p['id'])
+        for p, (created_date, _) in zip(playlists, results):
+            p['created_date'] = created_date
         # Top 10 albums (first 10 from API)
         top_albums = playlists[:10]
         # Created date sorted (earliest first)
-        created_date_playlists = sorted(playlists, key=lambda x: x.get(
-            'created_date') or '9999-99-99T99:99:99Z')[:10]
+        created_date_playlists = heapq.nsmallest(10, playlists, key=lambda x: x.get(
+            'created_date') or '9999-99-99T99:99:99Z')
         # Generate HTML for all playlists
-        for playlist in playlists:
+        for playlist, (_, rows) in zip(playlists, results):
             pid = playlist['id']
             output_html = f"{pid}.html"
             print(f"[+] Generating {output_html}")
-            items = fetch_tracks(sp, pid)
-            rows = to_rows(items)
-            fieldnames = list(rows[0].keys()) if rows else ["title", "artists", "album",
-                                                            "duration_ms", "duration_mm_ss", "added_at", "spotify_url", "spotify_uri"]
+            fieldnames = row_fieldnames(rows)
             generate_html(playlist['name'], fieldnames, rows, output_html)
             if LOGFIRE:
                 LOGFIRE.info('landing.playlist_page_generated', id=pid, output=output_html, tracks=len(rows))
@@ -422,29 +676,35 @@ def main():
         output = args.output or f"{playlist_id}.csv"
 
     print(f"[+] Exporting playlist {playlist_id} -> {output}")
-    items = fetch_tracks(sp, playlist_id)
-    rows = to_rows(items)
+    if args.cache:
+        tracks = cached_tracks(sp, playlist_id, playlist_info.get('snapshot_id'))
+    else:
+        tracks = iter_tracks(sp, playlist_id)
+    rows = to_rows(tracks)
 
     if args.include_audio_features:
-        track_ids = [item['track']['id'] for item in items if item.get(
-            'track') and item['track'].get('id')]
+        # Track IDs come from the row URIs so features line up with rows
+        # even when local files or episodes (no track ID) are mixed in
+        track_rows = [row for row in rows
+                      if row['spotify_uri'].startswith('spotify:track:')]
+        track_ids = [row['spotify_uri'].rsplit(':', 1)[1]
+                     for row in track_rows]
         if track_ids:
-            features_list = sp.audio_features(track_ids)
-            for row, features in zip(rows, features_list):
+            features_list = fetch_audio_features(sp, track_ids)
+            for row, features in zip(track_rows, features_list):
                 if features:
                     row.update(features)
 
-    fieldnames = list(rows[0].keys()) if rows else ["title", "artists", "album",
-                                                    "duration_ms", "duration_mm_ss", "added_at", "spotify_url", "spotify_uri"]
+    fieldnames = row_fieldnames(rows)
     if args.format == "html":
         generate_html(playlist_name, fieldnames, rows, output)
         if LOGFIRE:
             LOGFIRE.info('playlist.exported', id=playlist_id, format='html', output=output, tracks=len(rows))
     else:
         with open(output, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(map(row_values(fieldnames), rows))
         if LOGFIRE:
             LOGFIRE.info('playlist.exported', id=playlist_id, format='csv', output=output, tracks=len(rows))
 